@@ -6,41 +6,223 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
+import functools
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import orjson
+import requests
+from algosdk import constants
+from algosdk.error import AlgodHTTPError, AlgodResponseError
+from algosdk.v2client.algod import AlgodClient, api_version_path_prefix
+from cachetools import TTLCache
 from flask import Flask, render_template, request, jsonify, redirect, url_for
+from flask.json.provider import DefaultJSONProvider
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 import algokit_utils
 from smart_contracts.artifacts.compliance_engine.compliance_engine_client import (
     ComplianceEngineClient,
 )
 
+# ── Configuration (read once at import) ────────────────────────────────────────
+APP_ID = int(os.environ.get("APP_ID", "0"))
+SENDER_ADDRESS = os.environ.get("SENDER_ADDRESS", "")
+DEBUG = os.environ.get("FLASK_DEBUG", "0") == "1"
+PORT = int(os.environ.get("PORT", 5000))
+
 app = Flask(__name__, 
             template_folder=os.path.join(os.path.dirname(__file__), 'templates'),
             static_folder=os.path.join(os.path.dirname(__file__), 'static'))
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that serializes with orjson; loads stay on the default."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+
+app.json = OrjsonProvider(app)
+
+# Keep compiled Jinja templates cached unless running in debug mode
+if not DEBUG:
+    app.config["TEMPLATES_AUTO_RELOAD"] = False
+    app.jinja_env.auto_reload = False
+
+# Warm the template cache so the first request to each page doesn't pay
+# for loading and compiling its template
+for _template in ("index.html", "create.html", "approve.html", "certify.html", "vendor.html"):
+    app.jinja_env.get_template(_template)
+
 # ── Algorand connection ────────────────────────────────────────────────────────
-def get_client() -> ComplianceEngineClient:
-    algorand = algokit_utils.AlgorandClient.from_environment()
-    app_id = int(os.environ.get("APP_ID", "0"))
-    sender = os.environ.get("SENDER_ADDRESS", "")
-    return ComplianceEngineClient(
-        algorand=algorand,
-        app_id=app_id,
-        default_sender=sender,
+class PooledAlgodClient(AlgodClient):
+    """
+    AlgodClient that sends requests over a keep-alive requests.Session.
+    The stock client opens a fresh urllib connection (and TLS handshake) per call.
+    algod_request mirrors AlgodClient.algod_request from py-algorand-sdk 2.x,
+    hence the algosdk<3 pin in requirements.txt.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Read/status retries only apply to idempotent methods, but urllib3 still
+        # retries connect errors on any method, POST included (the request was
+        # never sent in that case)
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=64,
+            max_retries=Retry(total=3, backoff_factor=0.1),
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def algod_request(
+        self,
+        method,
+        requrl,
+        params=None,
+        data=None,
+        headers=None,
+        response_format="json",
+        timeout=30,
+        **kwargs,
+    ):
+        header = {"User-Agent": "py-algorand-sdk"}
+        if self.headers:
+            header.update(self.headers)
+        if headers:
+            header.update(headers)
+        if requrl not in constants.no_auth:
+            header[constants.algod_auth_header] = self.algod_token
+        if requrl not in constants.unversioned_paths:
+            requrl = api_version_path_prefix + requrl
+
+        resp = self.session.request(
+            method,
+            self.algod_address + requrl,
+            params=params,
+            data=data,
+            headers=header,
+            timeout=timeout,
+        )
+        if not resp.ok:
+            try:
+                message = resp.json()["message"]
+            except (ValueError, KeyError):
+                message = resp.text
+            raise AlgodHTTPError(message, resp.status_code)
+        if response_format == "json":
+            try:
+                return resp.json()
+            except ValueError as e:
+                raise AlgodResponseError(f"Failed to parse JSON response from algod: {e}") from e
+        return resp.content
+
+
+def build_algorand() -> algokit_utils.AlgorandClient:
+    # Falls back to LocalNet when ALGOD_SERVER is unset, like from_environment()
+    config = algokit_utils.ClientManager.get_config_from_environment_or_localnet().algod_config
+    algod = PooledAlgodClient(
+        algod_token=config.token or "",
+        algod_address=config.full_url(),
     )
+    return algokit_utils.AlgorandClient.from_clients(algod=algod)
+
+
+# Built once and shared across requests so the algod HTTP session (and its
+# keep-alive connections) is reused instead of being rebuilt on every call.
+_ALGORAND: algokit_utils.AlgorandClient | None = None
+_CLIENT: ComplianceEngineClient | None = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_client() -> ComplianceEngineClient:
+    global _ALGORAND, _CLIENT
+    if _CLIENT is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                _ALGORAND = build_algorand()
+                _CLIENT = ComplianceEngineClient(
+                    algorand=_ALGORAND,
+                    app_id=APP_ID,
+                    default_sender=SENDER_ADDRESS,
+                )
+    return _CLIENT
+
+
+@functools.lru_cache(maxsize=1)
+def get_creator_address() -> str:
+    """The app creator (admin) is fixed at deploy time, so look it up once."""
+    algod = get_client().algorand.client.algod
+    return algod.application_info(APP_ID)["params"]["creator"]
 
 
 STATUS_LABELS = {0: "CREATED", 1: "APPROVED", 2: "CERTIFIED", 99: "NOT FOUND"}
 ROLE_LABELS   = {0: "ADMIN",   1: "VENDOR",   2: "INSPECTOR", 99: "NONE"}
 
 
+# ── Batch read cache ───────────────────────────────────────────────────────────
+# (status_code, asa_id) per batch_id. Non-terminal states change at most once
+# per block (~4s); CERTIFIED is terminal so those entries never expire.
+_BATCH_CACHE: TTLCache = TTLCache(maxsize=4096, ttl=4)
+_CERTIFIED_CACHE: dict[str, tuple[int, int]] = {}
+# Bumped on every invalidation so a read that raced a write doesn't cache stale
+# state. Global rather than per batch, so it stays bounded; the cost is that a
+# write to any batch occasionally skips caching an unrelated read.
+_BATCH_GENERATION = 0
+_BATCH_CACHE_LOCK = threading.Lock()
+
+
+def read_batch(batch_id: str) -> tuple[int, int]:
+    """Return (status_code, asa_id) for a batch, served from cache when fresh."""
+    with _BATCH_CACHE_LOCK:
+        cached = _CERTIFIED_CACHE.get(batch_id) or _BATCH_CACHE.get(batch_id)
+        generation = _BATCH_GENERATION
+    if cached is not None:
+        return cached
+
+    client = get_client()
+    # Both reads are readonly: simulate them as one group (single round-trip)
+    response = (
+        client.new_group()
+        .get_batch_status_v2(args=(batch_id.encode(),))
+        .get_batch_asset(args=(batch_id.encode(),))
+        .simulate(allow_unnamed_resources=True, skip_signatures=True)
+    )
+    entry = (response.returns[0].value, response.returns[1].value)
+
+    with _BATCH_CACHE_LOCK:
+        if _BATCH_GENERATION != generation:
+            return entry  # invalidated mid-read; don't store a possibly stale result
+        if entry[0] == 2:  # CERTIFIED
+            _CERTIFIED_CACHE[batch_id] = entry
+            _BATCH_CACHE.pop(batch_id, None)
+        else:
+            _BATCH_CACHE[batch_id] = entry
+    return entry
+
+
+def invalidate_batch(batch_id: str) -> None:
+    global _BATCH_GENERATION
+    with _BATCH_CACHE_LOCK:
+        _BATCH_GENERATION += 1
+        _BATCH_CACHE.pop(batch_id, None)
+
+
 # ── Routes ─────────────────────────────────────────────────────────────────────
 
 @app.route("/")
 def index():
     """Dashboard: show app ID and quick status."""
-    app_id = int(os.environ.get("APP_ID", "0"))
-    return render_template("index.html", app_id=app_id)
+    return render_template("index.html", app_id=APP_ID)
 
 
 @app.route("/create", methods=["GET", "POST"])
@@ -57,6 +239,7 @@ def create():
                 response = client.send.create_batch_v2(
                     args=(batch_id.encode(),)
                 )
+                invalidate_batch(batch_id)
                 result = {
                     "batch_id": batch_id,
                     "status": "CREATED",
@@ -81,6 +264,7 @@ def approve():
                 response = client.send.approve_batch_v2(
                     args=(batch_id.encode(),)
                 )
+                invalidate_batch(batch_id)
                 result = {
                     "batch_id": batch_id,
                     "status": "APPROVED",
@@ -105,14 +289,14 @@ def certify():
                 response = client.send.certify_batch(
                     args=(batch_id.encode(),)
                 )
-                # Fetch minted ASA ID
-                asa_response = client.send.get_batch_asset(
-                    args=(batch_id.encode(),)
-                )
+                # The minted ASA ID comes from the inner asset-config txn,
+                # so no follow-up get_batch_asset call is needed
+                asa_id = response.confirmations[0]["inner-txns"][0]["asset-index"]
+                invalidate_batch(batch_id)
                 result = {
                     "batch_id": batch_id,
                     "status": "CERTIFIED",
-                    "asa_id": asa_response.abi_return,
+                    "asa_id": asa_id,
                     "tx_id": response.tx_id,
                 }
             except Exception as e:
@@ -120,29 +304,66 @@ def certify():
     return render_template("certify.html", result=result, error=error)
 
 
+# Batches shown per vendor page; one page is read as a single simulated group,
+# which is capped at 16 transactions
+VENDOR_PAGE_SIZE = 16
+
+
+def read_vendor_batches(address: str, page: int) -> tuple[int, int, list[str]]:
+    """
+    Return (total batch count, page, batch IDs on page) for a vendor.
+    `page` is clamped to the last page so out-of-range requests still show batches.
+    """
+    client = get_client()
+    count = client.send.get_vendor_batch_count(args=(address,)).abi_return
+    page = min(page, max(count - 1, 0) // VENDOR_PAGE_SIZE)
+    start = page * VENDOR_PAGE_SIZE
+    stop = min(start + VENDOR_PAGE_SIZE, count)
+    if start >= stop:
+        return count, page, []
+
+    group = client.new_group()
+    for index in range(start, stop):
+        group.get_vendor_batch_at(args=(address, index))
+    response = group.simulate(allow_unnamed_resources=True, skip_signatures=True)
+    return count, page, [bytes(r.value).decode() for r in response.returns]
+
+
+def lookup_role(address: str) -> str:
+    # The creator is always ADMIN, no ABI call needed
+    if address == get_creator_address():
+        return ROLE_LABELS[0]
+    role_response = get_client().send.get_role(args=(address,))
+    return ROLE_LABELS.get(role_response.abi_return, "UNKNOWN")
+
+
+# Shared pool for fanning out independent algod reads within a request
+_READ_POOL = ThreadPoolExecutor(max_workers=8)
+READ_TIMEOUT = 30
+
+
 @app.route("/vendor/<address>")
 def vendor(address: str):
+    page = max(request.args.get("page", 0, type=int), 0)
     batches = []
+    batch_count = 0
     error = None
     role = "UNKNOWN"
     try:
-        client = get_client()
-        # Get vendor batches
-        batches_response = client.send.get_vendor_batches(
-            args=(address,)
-        )
-        raw = batches_response.abi_return or ""
-        batches = [b for b in raw.split("|") if b]
-
-        # Get role
-        role_response = client.send.get_role(args=(address,))
-        role = ROLE_LABELS.get(role_response.abi_return, "UNKNOWN")
+        # Batches and role are independent reads: fetch them concurrently
+        batches_future = _READ_POOL.submit(read_vendor_batches, address, page)
+        role_future = _READ_POOL.submit(lookup_role, address)
+        batch_count, page, batches = batches_future.result(timeout=READ_TIMEOUT)
+        role = role_future.result(timeout=READ_TIMEOUT)
     except Exception as e:
         error = str(e)
     return render_template(
         "vendor.html",
         address=address,
         batches=batches,
+        batch_count=batch_count,
+        page=page,
+        page_size=VENDOR_PAGE_SIZE,
         role=role,
         error=error,
     )
@@ -152,20 +373,17 @@ def vendor(address: str):
 def api_batch_status(batch_id: str):
     """JSON API endpoint for batch status + ASA."""
     try:
-        client = get_client()
-        status_resp = client.send.get_batch_status_v2(args=(batch_id.encode(),))
-        asset_resp  = client.send.get_batch_asset(args=(batch_id.encode(),))
-        status_code = status_resp.abi_return
+        status_code, asa_id = read_batch(batch_id)
         return jsonify({
             "batch_id": batch_id,
             "status_code": status_code,
             "status_label": STATUS_LABELS.get(status_code, "UNKNOWN"),
-            "asa_id": asset_resp.abi_return,
+            "asa_id": asa_id,
         })
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
 if __name__ == "__main__":
-    port = int(os.environ.get("PORT", 5000))
-    app.run(host="0.0.0.0", port=port, debug=os.environ.get("FLASK_DEBUG", "0") == "1")
\ No newline at end of file
+    # Development server only; containers run the app under gunicorn
+    app.run(host="0.0.0.0", port=PORT, debug=DEBUG)
\ No newline at end of file
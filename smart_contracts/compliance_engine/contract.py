@@ -1,15 +1,16 @@
+import typing
+
 from algopy import (
     ARC4Contract,
     Bytes,
     Global,
-    String,
     Txn,
     UInt64,
     arc4,
     itxn,
     op,
 )
-from algopy.arc4 import abimethod, Address, DynamicArray, DynamicBytes
+from algopy.arc4 import abimethod, Address, DynamicArray, DynamicBytes, StaticBytes
 
 
 # ─── Constants ────────────────────────────────────────────────────────────────
@@ -21,6 +22,27 @@ ROLE_ADMIN = UInt64(0)
 ROLE_VENDOR = UInt64(1)
 ROLE_INSPECTOR = UInt64(2)
 
+# Roles are stored as a single byte in the role: box
+ROLE_VENDOR_BYTE = Bytes(b"\x01")
+ROLE_INSPECTOR_BYTE = Bytes(b"\x02")
+
+# Box key prefixes
+ROLE_PREFIX = Bytes(b"role:")
+BATCH_PREFIX = Bytes(b"batch:")
+ASSET_PREFIX = Bytes(b"asset:")
+VENDOR_COUNT_PREFIX = Bytes(b"vcnt:")
+VENDOR_INDEX_PREFIX = Bytes(b"vidx:")
+CERT_NAME_PREFIX = Bytes(b"CERT-")
+
+# Feature 3: Audit log event, emitted once per state-changing call
+AuditAction = StaticBytes[typing.Literal[16]]
+
+
+class AuditEvent(arc4.Struct):
+    action: AuditAction  # zero-padded action name
+    subject: DynamicBytes  # batch ID, or account for assign_role
+    sender: Address
+
 
 class ComplianceEngine(ARC4Contract):
 
@@ -32,7 +54,8 @@ class ComplianceEngine(ARC4Contract):
     # batch_status:  Bytes → UInt64
     # batch_asset:   Bytes → UInt64   (ASA ID per batch)
     # vendor_role:   Address → UInt64 (role registry)
-    # vendor_batches: Address → arc4.String  (pipe-delimited batch list)
+    # vendor_count:  Address → UInt64         (number of batches per vendor)
+    # vendor_batch:  Address + index → Bytes  (one box per batch ID)
 
     # ─────────────────────────────────────────────────────────────────────────
     # ORIGINAL METHODS — Preserved untouched
@@ -59,18 +82,17 @@ class ComplianceEngine(ARC4Contract):
         """
         Assign a role (ROLE_VENDOR=1, ROLE_INSPECTOR=2) to an account.
         Only admin (creator) can call this.
-        Emits: assign_role event log.
+        Emits: AuditEvent log.
         """
         assert Txn.sender == Global.creator_address, "Only admin can assign roles"
         assert role == UInt64(1) or role == UInt64(2), "Invalid role"
 
-        # Store role in box: key = b"role:" + account_bytes
-        key = Bytes(b"role:") + account.bytes
-        op.Box.put(key, op.itob(role))
+        # Store role in box: key = ROLE_PREFIX + account_bytes, value = 1 byte
+        key = ROLE_PREFIX + account.bytes
+        op.Box.put(key, op.itob(role)[7:])
 
         # Feature 3: Audit log
-        log_event = String("assign_role|") + String(account.bytes.hex()) + String("|") + String(Txn.sender.bytes.hex())
-        arc4.emit("assign_role", log_event)
+        arc4.emit(AuditEvent(AuditAction(b"assign_role\x00\x00\x00\x00\x00"), DynamicBytes(account.bytes), Address(Txn.sender)))
 
         return role
 
@@ -83,32 +105,31 @@ class ComplianceEngine(ARC4Contract):
         Feature 4: Appends batch_id to vendor registry.
         Feature 3: Emits audit log.
         """
+        sender_bytes = Txn.sender.bytes
+
         # Role check: sender must be ROLE_VENDOR
-        role_key = Bytes(b"role:") + Txn.sender.bytes
-        role_val, role_exists = op.Box.get(role_key)
+        role_val, role_exists = op.Box.get(ROLE_PREFIX + sender_bytes)
         assert role_exists, "Sender has no assigned role"
-        assert op.btoi(role_val) == UInt64(1), "Only ROLE_VENDOR can create batches"
-
-        # State check: batch must not already exist
-        state_key = Bytes(b"batch:") + batch_id
-        _, already_exists = op.Box.get(state_key)
-        assert not already_exists, "Batch already exists"
-
-        # Store batch state = CREATED (0)
-        op.Box.put(state_key, op.itob(UInt64(0)))
-
-        # Feature 4: Append batch_id to vendor's list
-        vendor_key = Bytes(b"vendor:") + Txn.sender.bytes
-        existing, vend_exists = op.Box.get(vendor_key)
-        if vend_exists:
-            new_val = existing + Bytes(b"|") + batch_id
-        else:
-            new_val = batch_id
-        op.Box.put(vendor_key, new_val)
+        assert role_val == ROLE_VENDOR_BYTE, "Only ROLE_VENDOR can create batches"
+
+        # Create batch box; a new box is zero-filled, i.e. state = CREATED (0).
+        # Box.create fails to create if the batch already exists.
+        state_key = BATCH_PREFIX + batch_id
+        created = op.Box.create(state_key, UInt64(8))
+        assert created, "Batch already exists"
+
+        # Feature 4: Append batch_id to vendor's index (fixed-size writes only).
+        # Slots hold the ARC-4 encoded batch_id so readers can return it as-is.
+        count_key = VENDOR_COUNT_PREFIX + sender_bytes
+        count_val, count_exists = op.Box.get(count_key)
+        count = UInt64(0)
+        if count_exists:
+            count = op.btoi(count_val)
+        op.Box.put(VENDOR_INDEX_PREFIX + sender_bytes + op.itob(count), DynamicBytes(batch_id).bytes)
+        op.Box.put(count_key, op.itob(count + 1))
 
         # Feature 3: Audit log
-        log_event = String("create_batch|") + String(batch_id.hex()) + String("|") + String(Txn.sender.bytes.hex())
-        arc4.emit("create_batch", log_event)
+        arc4.emit(AuditEvent(AuditAction(b"create_batch\x00\x00\x00\x00"), DynamicBytes(batch_id), Address(sender_bytes)))
 
         return UInt64(0)  # STATUS_CREATED
 
@@ -120,14 +141,15 @@ class ComplianceEngine(ARC4Contract):
         Transitions CREATED → APPROVED.
         Feature 3: Emits audit log.
         """
+        sender_bytes = Txn.sender.bytes
+
         # Role check
-        role_key = Bytes(b"role:") + Txn.sender.bytes
-        role_val, role_exists = op.Box.get(role_key)
+        role_val, role_exists = op.Box.get(ROLE_PREFIX + sender_bytes)
         assert role_exists, "Sender has no assigned role"
-        assert op.btoi(role_val) == UInt64(2), "Only ROLE_INSPECTOR can approve batches"
+        assert role_val == ROLE_INSPECTOR_BYTE, "Only ROLE_INSPECTOR can approve batches"
 
         # State transition check
-        state_key = Bytes(b"batch:") + batch_id
+        state_key = BATCH_PREFIX + batch_id
         state_val, state_exists = op.Box.get(state_key)
         assert state_exists, "Batch does not exist"
         assert op.btoi(state_val) == UInt64(0), "Batch must be in CREATED state"
@@ -136,8 +158,7 @@ class ComplianceEngine(ARC4Contract):
         op.Box.put(state_key, op.itob(UInt64(1)))
 
         # Feature 3: Audit log
-        log_event = String("approve_batch|") + String(batch_id.hex()) + String("|") + String(Txn.sender.bytes.hex())
-        arc4.emit("approve_batch", log_event)
+        arc4.emit(AuditEvent(AuditAction(b"approve_batch\x00\x00\x00"), DynamicBytes(batch_id), Address(sender_bytes)))
 
         return UInt64(1)  # STATUS_APPROVED
 
@@ -150,16 +171,17 @@ class ComplianceEngine(ARC4Contract):
         Feature 2: Mints certification NFT (ASA) via inner transaction.
         Feature 3: Emits audit log.
         """
+        sender_bytes = Txn.sender.bytes
+
         # Role check: admin OR inspector
         is_admin = Txn.sender == Global.creator_address
         if not is_admin:
-            role_key = Bytes(b"role:") + Txn.sender.bytes
-            role_val, role_exists = op.Box.get(role_key)
+            role_val, role_exists = op.Box.get(ROLE_PREFIX + sender_bytes)
             assert role_exists, "Sender has no assigned role"
-            assert op.btoi(role_val) == UInt64(2), "Only admin or ROLE_INSPECTOR can certify"
+            assert role_val == ROLE_INSPECTOR_BYTE, "Only admin or ROLE_INSPECTOR can certify"
 
         # State transition check
-        state_key = Bytes(b"batch:") + batch_id
+        state_key = BATCH_PREFIX + batch_id
         state_val, state_exists = op.Box.get(state_key)
         assert state_exists, "Batch does not exist"
         assert op.btoi(state_val) == UInt64(1), "Batch must be in APPROVED state"
@@ -168,7 +190,7 @@ class ComplianceEngine(ARC4Contract):
         op.Box.put(state_key, op.itob(UInt64(2)))
 
         # ── Feature 2: Mint Certification NFT ─────────────────────────────────
-        asset_name = Bytes(b"CERT-") + batch_id
+        asset_name = CERT_NAME_PREFIX + batch_id
         created_asset = itxn.AssetConfig(
             total=1,
             decimals=0,
@@ -185,13 +207,12 @@ class ComplianceEngine(ARC4Contract):
         asa_id = created_asset.created_asset.id
 
         # Store ASA ID → batch mapping
-        asset_key = Bytes(b"asset:") + batch_id
+        asset_key = ASSET_PREFIX + batch_id
         op.Box.put(asset_key, op.itob(asa_id))
         # ──────────────────────────────────────────────────────────────────────
 
         # Feature 3: Audit log
-        log_event = String("certify_batch|") + String(batch_id.hex()) + String("|") + String(Txn.sender.bytes.hex())
-        arc4.emit("certify_batch", log_event)
+        arc4.emit(AuditEvent(AuditAction(b"certify_batch\x00\x00\x00"), DynamicBytes(batch_id), Address(sender_bytes)))
 
         return UInt64(2)  # STATUS_CERTIFIED
 
@@ -205,7 +226,7 @@ class ComplianceEngine(ARC4Contract):
         Feature 4: Get the current state of a batch by Bytes ID.
         Returns 0=CREATED, 1=APPROVED, 2=CERTIFIED, 99=NOT_FOUND.
         """
-        state_key = Bytes(b"batch:") + batch_id
+        state_key = BATCH_PREFIX + batch_id
         state_val, state_exists = op.Box.get(state_key)
         if state_exists:
             return op.btoi(state_val)
@@ -217,23 +238,30 @@ class ComplianceEngine(ARC4Contract):
         Feature 2: Get ASA ID for a certified batch.
         Returns 0 if not certified.
         """
-        asset_key = Bytes(b"asset:") + batch_id
+        asset_key = ASSET_PREFIX + batch_id
         asset_val, asset_exists = op.Box.get(asset_key)
         if asset_exists:
             return op.btoi(asset_val)
         return UInt64(0)
 
     @abimethod(readonly=True)
-    def get_vendor_batches(self, vendor: Address) -> arc4.String:
+    def get_vendor_batch_count(self, vendor: Address) -> UInt64:
+        """
+        Feature 4: Return the number of batches created by a vendor.
+        """
+        count_val, count_exists = op.Box.get(VENDOR_COUNT_PREFIX + vendor.bytes)
+        if count_exists:
+            return op.btoi(count_val)
+        return UInt64(0)
+
+    @abimethod(readonly=True)
+    def get_vendor_batch_at(self, vendor: Address, index: UInt64) -> DynamicBytes:
         """
-        Feature 4: Return pipe-delimited list of batch IDs for a vendor.
-        Returns empty string if vendor has no batches.
+        Feature 4: Return the batch ID at position `index` in a vendor's history.
         """
-        vendor_key = Bytes(b"vendor:") + vendor.bytes
-        vendor_val, vend_exists = op.Box.get(vendor_key)
-        if vend_exists:
-            return arc4.String(vendor_val.decode())
-        return arc4.String("")
+        batch_val, batch_exists = op.Box.get(VENDOR_INDEX_PREFIX + vendor.bytes + op.itob(index))
+        assert batch_exists, "Index out of range"
+        return DynamicBytes.from_bytes(batch_val)
 
     @abimethod(readonly=True)
     def get_role(self, account: Address) -> UInt64:
@@ -243,8 +271,7 @@ class ComplianceEngine(ARC4Contract):
         """
         if account.bytes == Global.creator_address.bytes:
             return UInt64(0)
-        role_key = Bytes(b"role:") + account.bytes
-        role_val, role_exists = op.Box.get(role_key)
+        role_val, role_exists = op.Box.get(ROLE_PREFIX + account.bytes)
         if role_exists:
-            return op.btoi(role_val)
+            return op.btoi(role_val)  # single-byte role value
         return UInt64(99)  # NONE
\ No newline at end of file
@@ -30,13 +30,19 @@ def deploy() -> None:
     # ── NEW: Fund app account to cover minimum balance for box storage ────────
     # Each box requires ~0.0025 ALGO per box + 0.0004 ALGO per byte stored.
     # Pre-fund with 1 ALGO to support initial batch/role/vendor boxes.
-    fund_amount = algokit_utils.AlgoAmount(algo=1)
-    algorand.send.payment(
-        algokit_utils.PaymentParams(
-            sender=deployer_.address,
-            receiver=app_client.app_address,
-            amount=fund_amount,
+    # The app address only exists once the create txn is confirmed, so funding
+    # can't share its group; skip it entirely when an existing app was reused.
+    if result.operation_performed in [
+        algokit_utils.OperationPerformed.Create,
+        algokit_utils.OperationPerformed.Replace,
+    ]:
+        fund_amount = algokit_utils.AlgoAmount(algo=1)
+        algorand.send.payment(
+            algokit_utils.PaymentParams(
+                sender=deployer_.address,
+                receiver=app_client.app_address,
+                amount=fund_amount,
+            )
         )
-    )
-    print(f"Funded app address {app_client.app_address} with {fund_amount} for box storage")
+        print(f"Funded app address {app_client.app_address} with {fund_amount} for box storage")
     # ─────────────────────────────────────────────────────────────────────────
\ No newline at end of file